@@ -0,0 +1,50 @@
+import hashlib
+import os
+import tempfile
+from pathlib import Path
+
+CACHE_DIR = Path.home() / ".cache" / "lecture2obsidian"
+
+
+def cache_enabled() -> bool:
+    """Return False when caching is disabled with L2O_NO_CACHE=1."""
+    return os.getenv("L2O_NO_CACHE") != "1"
+
+
+def text_key(*parts: str) -> str:
+    """Return a SHA-256 hex digest of the NUL-joined parts."""
+    return hashlib.sha256("\0".join(parts).encode("utf-8")).hexdigest()
+
+
+def file_key(path: Path) -> str:
+    """Return a SHA-256 hex digest of a file's contents, read in 1 MiB blocks."""
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def get_cached(namespace: str, key: str) -> str | None:
+    """Return the cached text for key, or None on a miss."""
+    try:
+        return (CACHE_DIR / namespace / key).read_text(encoding="utf-8")
+    except OSError:
+        return None
+
+
+def store_cached(namespace: str, key: str, value: str) -> None:
+    """Store text under key. Best-effort — errors are silently ignored.
+
+    Writes to a temporary file and renames it into place, so concurrent
+    readers never see a partial entry.
+    """
+    directory = CACHE_DIR / namespace
+    try:
+        directory.mkdir(parents=True, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=directory)
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            f.write(value)
+        os.replace(tmp_path, directory / key)
+    except OSError:
+        pass
@@ -5,7 +5,7 @@ import subprocess
 import sys
 import threading
 import traceback
-from datetime import date, datetime, time
+from datetime import date, datetime, time, timedelta
 from pathlib import Path
 
 import click
@@ -20,19 +20,21 @@ if str(_ROOT) not in sys.path:
 load_dotenv(_ROOT / ".env")
 
 from app.notify import send_notification
-from app.recorder import Recorder
 from app.state import (
     LOG_FILE,
     STATE_DIR,
     clear_state,
     get_recording_info,
     is_recording,
+    wait_for_exit,
     write_state,
 )
-from app.summarize import summarize_transcript
-from app.transcribe import check_ffmpeg, transcribe_audio
 from app.writer import load_config, write_notes
 
+# app.recorder (sounddevice/PortAudio), app.transcribe and app.summarize (openai)
+# are imported inside the commands that use them so that `status` and the stop
+# branch of `toggle` start quickly.
+
 SUPPORTED_EXTENSIONS = {".mp3", ".m4a", ".wav", ".ogg", ".flac", ".webm"}
 CONFIG_PATH = _ROOT / "config.yaml"
 
@@ -47,6 +49,39 @@ def _check_api_key() -> None:
         sys.exit(1)
 
 
+def _approx_word_count(text: str) -> int:
+    """Count words by counting spaces — avoids building a word list just to log it."""
+    return text.count(" ") + 1 if text else 0
+
+
+ScheduleEntry = tuple[time, time, str | None, str]
+
+_SCHEDULE_BUFFER = timedelta(minutes=15)
+
+
+def _parse_schedule(schedule: dict) -> dict[str, list[ScheduleEntry]]:
+    """Parse config["schedule"] into {weekday: [(start, end, course, title_prefix), ...]}.
+
+    Entries whose "time" is not a valid "HH:MM-HH:MM" range are skipped.
+    """
+    parsed: dict[str, list[ScheduleEntry]] = {}
+    for day_name, entries in (schedule or {}).items():
+        day_entries: list[ScheduleEntry] = []
+        for entry in entries or []:
+            try:
+                start_str, end_str = entry.get("time", "").split("-")
+                start_h, start_m = map(int, start_str.strip().split(":"))
+                end_h, end_m = map(int, end_str.strip().split(":"))
+                start_t, end_t = time(start_h, start_m), time(end_h, end_m)
+            except (ValueError, AttributeError):
+                continue
+            day_entries.append(
+                (start_t, end_t, entry.get("course"), entry.get("title_prefix", "Lecture"))
+            )
+        parsed[day_name] = day_entries
+    return parsed
+
+
 def _infer_course(config: dict) -> tuple[str, str]:
     """Return (course, title_prefix) based on the current day and time.
 
@@ -54,33 +89,18 @@ def _infer_course(config: dict) -> tuple[str, str]:
     falls within the scheduled range ± 15 minutes. Falls back to
     config["default_course"] if no match is found.
     """
-    schedule = config.get("schedule", {})
+    schedule = _parse_schedule(config.get("schedule", {}))
     default_course = config.get("default_course", "Lecture")
 
     now = datetime.now()
     day_name = now.strftime("%A")  # e.g. "Monday"
-    day_schedule = schedule.get(day_name, [])
-
-    buffer_minutes = 15
-
-    for entry in day_schedule:
-        time_range = entry.get("time", "")
-        try:
-            start_str, end_str = time_range.split("-")
-            start_h, start_m = map(int, start_str.strip().split(":"))
-            end_h, end_m = map(int, end_str.strip().split(":"))
-        except (ValueError, AttributeError):
-            continue
-
-        start_dt = now.replace(hour=start_h, minute=start_m, second=0, microsecond=0)
-        end_dt = now.replace(hour=end_h, minute=end_m, second=0, microsecond=0)
-
-        from datetime import timedelta
-        window_start = start_dt - timedelta(minutes=buffer_minutes)
-        window_end = end_dt + timedelta(minutes=buffer_minutes)
+    today = now.date()
 
+    for start_t, end_t, course, title_prefix in schedule.get(day_name, []):
+        window_start = datetime.combine(today, start_t) - _SCHEDULE_BUFFER
+        window_end = datetime.combine(today, end_t) + _SCHEDULE_BUFFER
         if window_start <= now <= window_end:
-            return entry.get("course", default_course), entry.get("title_prefix", "Lecture")
+            return course or default_course, title_prefix
 
     return default_course, "Lecture"
 
@@ -97,6 +117,58 @@ def _archive_wav(wav_path: Path, config: dict) -> None:
         wav_path.unlink(missing_ok=True)
 
 
+def _spawn_recorder(course: str, title: str, note_date: str, log_file) -> int:
+    """Run the `_record` command in a detached background process and return its PID.
+
+    On Linux the CLI forks, so the child reuses this already-running
+    interpreter instead of booting a new one. Elsewhere a fresh interpreter
+    is launched with `python -m app.cli _record`; fork without exec is
+    unsafe on macOS, where system frameworks can crash the child.
+    """
+    if sys.platform.startswith("linux"):
+        sys.stdout.flush()
+        sys.stderr.flush()
+        pid = os.fork()
+        if pid > 0:
+            return pid
+
+        # Child: detach from the terminal, log to LOG_FILE, and never return
+        # into the parent's click invocation.
+        exit_code = 0
+        try:
+            os.setsid()
+            devnull = os.open(os.devnull, os.O_RDONLY)
+            os.dup2(devnull, 0)
+            os.close(devnull)
+            os.dup2(log_file.fileno(), 1)
+            os.dup2(log_file.fileno(), 2)
+            record_internal.callback(course=course, title=title, note_date=note_date)
+        except SystemExit as exc:
+            exit_code = exc.code if isinstance(exc.code, int) else 1
+        except BaseException:
+            traceback.print_exc()
+            exit_code = 1
+        finally:
+            sys.stdout.flush()
+            sys.stderr.flush()
+            os._exit(exit_code)
+
+    cmd = [
+        sys.executable, "-m", "app.cli", "_record",
+        "--course", course,
+        "--title", title,
+        "--date", note_date,
+    ]
+    proc = subprocess.Popen(
+        cmd,
+        cwd=str(_ROOT),
+        stdout=log_file,
+        stderr=log_file,
+        start_new_session=True,
+    )
+    return proc.pid
+
+
 @click.group()
 def cli():
     """lecture-to-obsidian: turn lecture audio into Obsidian notes."""
@@ -118,6 +190,9 @@ def cli():
 )
 def process(audio_file: str, title: str | None, course: str | None, note_date: str | None):
     """Transcribe AUDIO_FILE and write structured notes to your Obsidian vault."""
+    from app.summarize import summarize_transcript
+    from app.transcribe import check_ffmpeg, transcribe_audio
+
     audio_path = Path(audio_file)
     if not audio_path.exists():
         click.echo(f"Error: File not found: {audio_path}")
@@ -129,17 +204,19 @@ def process(audio_file: str, title: str | None, course: str | None, note_date: s
         )
         sys.exit(1)
 
-    check_ffmpeg()
     _check_api_key()
 
     config = load_config(CONFIG_PATH)
+    # faster-whisper decodes audio itself; only the API backend shells out to ffmpeg.
+    if config.get("transcription", {}).get("backend", "local") == "api":
+        check_ffmpeg()
     resolved_title = title or audio_path.stem
     resolved_date = note_date or str(date.today())
     model = config.get("summarization", {}).get("model", "gpt-4o-mini")
 
     click.echo(f"Transcribing {audio_path.name}...")
     transcript = transcribe_audio(audio_path, config)
-    click.echo(f"  Done. Transcript is {len(transcript.split()):,} words.")
+    click.echo(f"  Done. Transcript is {_approx_word_count(transcript):,} words.")
 
     click.echo("Summarizing transcript...")
     summary = summarize_transcript(transcript, title=resolved_title, course=course, model=model)
@@ -168,7 +245,12 @@ def process(audio_file: str, title: str | None, course: str | None, note_date: s
 @click.option("--course", default=None, help="Course code/name (overrides schedule detection)")
 @click.option("--title", default=None, help="Note title prefix (overrides schedule detection)")
 @click.option("--date", "note_date", default=None, help="Date in YYYY-MM-DD format")
-def toggle(course: str | None, title: str | None, note_date: str | None):
+@click.option(
+    "--wait",
+    is_flag=True,
+    help="When stopping, block until transcription and summarization finish",
+)
+def toggle(course: str | None, title: str | None, note_date: str | None, wait: bool):
     """Start or stop a live lecture recording.
 
     First call starts recording in the background.
@@ -181,11 +263,18 @@ def toggle(course: str | None, title: str | None, note_date: str | None):
         try:
             os.kill(pid, signal.SIGTERM)
             click.echo(f"Stopping recording for {course_name} (PID {pid})...")
-            click.echo("Transcription and summarization running in background.")
-            click.echo(f"Check {LOG_FILE} for progress. You'll get a notification when done.")
         except ProcessLookupError:
             click.echo("Recording process not found — clearing stale state.")
             clear_state()
+            return
+
+        if wait:
+            click.echo("Waiting for transcription and summarization to finish...")
+            wait_for_exit(pid)
+            click.echo(f"Done. See {LOG_FILE} for details.")
+        else:
+            click.echo("Transcription and summarization running in background.")
+            click.echo(f"Check {LOG_FILE} for progress. You'll get a notification when done.")
         return
 
     # Not recording — start
@@ -202,29 +291,17 @@ def toggle(course: str | None, title: str | None, note_date: str | None):
     STATE_DIR.mkdir(parents=True, exist_ok=True)
     log_file = open(LOG_FILE, "a")
 
-    cmd = [
-        sys.executable, "-m", "app.cli", "_record",
-        "--course", resolved_course,
-        "--title", resolved_title,
-        "--date", resolved_date,
-    ]
-
-    proc = subprocess.Popen(
-        cmd,
-        cwd=str(_ROOT),
-        stdout=log_file,
-        stderr=log_file,
-        start_new_session=True,
-    )
+    pid = _spawn_recorder(resolved_course, resolved_title, resolved_date, log_file)
+    log_file.close()
 
     write_state(
-        pid=proc.pid,
+        pid=pid,
         course=resolved_course,
         title=resolved_title,
         date=resolved_date,
     )
 
-    click.echo(f"Recording started for {resolved_course} (PID {proc.pid})")
+    click.echo(f"Recording started for {resolved_course} (PID {pid})")
     click.echo(f"  Title: {resolved_title}")
     click.echo(f"  Log:   {LOG_FILE}")
 
@@ -271,6 +348,10 @@ def status():
 @click.option("--date", "note_date", required=True)
 def record_internal(course: str, title: str, note_date: str):
     """Internal: capture audio until SIGTERM, then run the full pipeline."""
+    from app.recorder import Recorder
+    from app.summarize import summarize_transcript
+    from app.transcribe import transcribe_audio, transcribe_samples
+
     # Set up logging to stdout (which is redirected to LOG_FILE by the parent)
     logging.basicConfig(
         level=logging.INFO,
@@ -286,8 +367,46 @@ def record_internal(course: str, title: str, note_date: str):
 
     signal.signal(signal.SIGTERM, handle_sigterm)
 
+    config = load_config(CONFIG_PATH)
+    transcription_cfg = config.get("transcription", {})
+
     log.info(f"Starting recorder for course={course!r} title={title!r}")
     recorder = Recorder()
+
+    # With the local backend, transcribe in the background while recording so
+    # only the last chunk is left to do once the lecture ends.
+    live_parts: list[str] = []
+    live_failed = threading.Event()
+    live_thread: threading.Thread | None = None
+    chunks = None
+    live_enabled = transcription_cfg.get("live_transcription", True)
+    if live_enabled and transcription_cfg.get("backend", "local") == "local":
+        try:
+            chunks = recorder.chunks(transcription_cfg.get("live_chunk_seconds", 30))
+        except (TypeError, ValueError) as exc:
+            log.warning(f"Invalid live_chunk_seconds — will transcribe the WAV instead: {exc}")
+
+    if chunks is not None:
+
+        def transcribe_live():
+            try:
+                for i, samples in enumerate(chunks, 1):
+                    previous = live_parts[-1] if live_parts else ""
+                    text = transcribe_samples(samples, config, previous)
+                    if text:
+                        live_parts.append(text)
+                    log.info(f"Transcribed live chunk {i}")
+            except BaseException:
+                live_failed.set()
+                log.error(
+                    "Live transcription failed — will transcribe the WAV instead:\n"
+                    + traceback.format_exc()
+                )
+                for _ in chunks:  # keep draining so captured audio doesn't pile up
+                    pass
+
+        live_thread = threading.Thread(target=transcribe_live, daemon=True)
+
     try:
         recorder.start()
     except Exception as exc:
@@ -295,6 +414,8 @@ def record_internal(course: str, title: str, note_date: str):
         send_notification("❌ lecture-to-obsidian", f"Mic error: {exc}")
         clear_state()
         sys.exit(1)
+    if live_thread is not None:
+        live_thread.start()
 
     log.info("Recording... waiting for SIGTERM.")
     stop_event.wait()
@@ -306,12 +427,17 @@ def record_internal(course: str, title: str, note_date: str):
         wav_path = recorder.stop()
         log.info(f"WAV saved: {wav_path}")
 
-        config = load_config(CONFIG_PATH)
         model = config.get("summarization", {}).get("model", "gpt-4o-mini")
 
-        log.info("Transcribing...")
-        transcript = transcribe_audio(wav_path, config)
-        log.info(f"Transcript: {len(transcript.split())} words")
+        if live_thread is not None:
+            log.info("Finishing live transcription...")
+            live_thread.join()
+        if live_thread is not None and not live_failed.is_set():
+            transcript = " ".join(live_parts)
+        else:
+            log.info("Transcribing...")
+            transcript = transcribe_audio(wav_path, config)
+        log.info(f"Transcript: {_approx_word_count(transcript)} words")
 
         log.info("Summarizing...")
         summary = summarize_transcript(transcript, title=title, course=course, model=model)
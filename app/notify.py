@@ -1,11 +1,49 @@
+import functools
+import os
 import subprocess
 
 
+@functools.lru_cache(maxsize=1)
+def _notification_center():
+    """Return the shared NSUserNotificationCenter, or None if it isn't enabled.
+
+    Opt-in with L2O_NATIVE_NOTIFY=1: NSUserNotificationCenter is deprecated
+    since macOS 10.14 and silently drops notifications on recent releases
+    without reporting a failure. The center is also None when pyobjc isn't
+    installed or Python isn't running with a bundle identifier.
+    """
+    if os.getenv("L2O_NATIVE_NOTIFY") != "1":
+        return None
+    try:
+        from Foundation import NSUserNotificationCenter
+    except ImportError:
+        return None
+    try:
+        return NSUserNotificationCenter.defaultUserNotificationCenter()
+    except Exception:
+        return None
+
+
 def send_notification(title: str, message: str) -> None:
-    """Send a macOS notification via osascript.
+    """Send a macOS notification.
 
-    Silently ignores any errors — notifications are non-critical.
+    Runs osascript, or delivers in-process through pyobjc when opted in with
+    L2O_NATIVE_NOTIFY=1. Silently ignores any errors — notifications are
+    non-critical.
     """
+    center = _notification_center()
+    if center is not None:
+        try:
+            from Foundation import NSUserNotification
+
+            notification = NSUserNotification.alloc().init()
+            notification.setTitle_(title)
+            notification.setInformativeText_(message)
+            center.deliverNotification_(notification)
+            return
+        except Exception:
+            pass
+
     script = f'display notification "{message}" with title "{title}"'
     try:
         subprocess.run(
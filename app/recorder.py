@@ -1,8 +1,11 @@
+import os
 import queue
 import tempfile
 import threading
 import wave
+from collections.abc import Iterator
 from pathlib import Path
+from typing import BinaryIO
 
 import numpy as np
 import sounddevice as sd
@@ -10,23 +13,36 @@ import sounddevice as sd
 _SAMPLE_RATE = 16000
 _CHANNELS = 1
 _DTYPE = "int16"
-_BLOCK_SIZE = 1024  # frames per callback
+_BLOCK_SIZE = 8192  # frames per callback (~0.5 s at 16 kHz)
+_WRITE_BUFFER_BYTES = 1 << 20  # 1 MiB — keeps disk writes off most callbacks
 
 
 class Recorder:
     """Captures audio from the default microphone using sounddevice.
 
+    Audio is streamed to a temporary WAV file as it arrives, so memory use
+    stays at one block regardless of recording length.
+
     Usage:
         recorder = Recorder()
         recorder.start()
         # ... time passes ...
         wav_path = recorder.stop()
+
+    To process audio while recording is still in progress, call chunks()
+    before start() and consume the returned iterator from another thread.
     """
 
     def __init__(self, sample_rate: int = _SAMPLE_RATE) -> None:
         self._sample_rate = sample_rate
-        self._queue: queue.Queue[np.ndarray] = queue.Queue()
         self._stream: sd.InputStream | None = None
+        self._file: BinaryIO | None = None
+        self._wf: wave.Wave_write | None = None
+        self._wav_path: Path | None = None
+        self._frames_written = 0
+        self._chunk_queue: queue.Queue[np.ndarray | None] | None = None
+        self._chunk_buf: np.ndarray | None = None
+        self._chunk_fill = 0
         self._recording = False
         self._lock = threading.Lock()
 
@@ -41,25 +57,33 @@ class Recorder:
             if self._recording:
                 raise RuntimeError("Already recording.")
 
-            # Drain the queue from any previous run
-            while not self._queue.empty():
-                try:
-                    self._queue.get_nowait()
-                except queue.Empty:
-                    break
-
-            self._stream = sd.InputStream(
-                samplerate=self._sample_rate,
-                channels=_CHANNELS,
-                dtype=_DTYPE,
-                blocksize=_BLOCK_SIZE,
-                callback=self._callback,
-            )
-            self._stream.start()
+            fd, wav_path = tempfile.mkstemp(suffix=".wav", prefix="lecture_")
+            self._wav_path = Path(wav_path)
+            self._file = os.fdopen(fd, "wb", buffering=_WRITE_BUFFER_BYTES)
+            self._wf = wave.open(self._file, "wb")
+            self._wf.setnchannels(_CHANNELS)
+            self._wf.setsampwidth(2)  # int16 = 2 bytes
+            self._wf.setframerate(self._sample_rate)
+            self._frames_written = 0
+
+            try:
+                self._stream = sd.InputStream(
+                    samplerate=self._sample_rate,
+                    channels=_CHANNELS,
+                    dtype=_DTYPE,
+                    blocksize=_BLOCK_SIZE,
+                    callback=self._callback,
+                )
+                self._stream.start()
+            except Exception:
+                self._close_wav()
+                self._wav_path.unlink(missing_ok=True)
+                self._wav_path = None
+                raise
             self._recording = True
 
     def stop(self) -> Path:
-        """Stop recording and write captured audio to a temporary WAV file.
+        """Stop recording and finalize the temporary WAV file.
 
         Returns:
             Path to the written WAV file.
@@ -76,32 +100,66 @@ class Recorder:
             self._stream = None
             self._recording = False
 
-        # Collect all queued frames
-        frames: list[np.ndarray] = []
-        while not self._queue.empty():
-            try:
-                frames.append(self._queue.get_nowait())
-            except queue.Empty:
-                break
-
-        if not frames:
+        if self._chunk_queue is not None:
+            # Hand over the final partial chunk, then end the chunks() iterator.
+            if self._chunk_fill:
+                self._chunk_queue.put(self._chunk_buf[: self._chunk_fill])
+            self._chunk_queue.put(None)
+            self._chunk_queue = None
+            self._chunk_buf = None
+
+        # Closing the wave writer patches the RIFF/data lengths in the header.
+        self._close_wav()
+        wav_path = self._wav_path
+        self._wav_path = None
+
+        if self._frames_written == 0:
+            wav_path.unlink(missing_ok=True)
             raise ValueError("No audio captured — recording was empty.")
 
-        audio_data = np.concatenate(frames, axis=0)
+        return wav_path
 
-        _, wav_path = tempfile.mkstemp(suffix=".wav", prefix="lecture_")
-        with wave.open(wav_path, "wb") as wf:
-            wf.setnchannels(_CHANNELS)
-            wf.setsampwidth(2)  # int16 = 2 bytes
-            wf.setframerate(self._sample_rate)
-            wf.writeframes(audio_data.tobytes())
+    def chunks(self, duration_s: float = 30.0) -> Iterator[np.ndarray]:
+        """Stream the recording as fixed-length int16 mono chunks.
 
-        return Path(wav_path)
+        Must be called before start(). Each chunk is yielded as soon as
+        duration_s seconds have been captured; stop() yields the final
+        partial chunk and ends the iterator.
+
+        Raises:
+            RuntimeError: If already recording.
+            ValueError: If duration_s is shorter than one sample.
+        """
+        frames = int(duration_s * self._sample_rate)
+        if frames < 1:
+            raise ValueError(f"Chunk duration must be at least one sample, got {duration_s!r}s.")
+        with self._lock:
+            if self._recording:
+                raise RuntimeError("chunks() must be called before start().")
+            chunk_queue: queue.Queue[np.ndarray | None] = queue.Queue()
+            self._chunk_queue = chunk_queue
+            self._chunk_buf = np.empty(frames, dtype=np.int16)
+            self._chunk_fill = 0
+
+        def iterate() -> Iterator[np.ndarray]:
+            while (chunk := chunk_queue.get()) is not None:
+                yield chunk
+
+        return iterate()
 
     def is_recording(self) -> bool:
         """Return True if currently capturing audio."""
         return self._recording
 
+    def _close_wav(self) -> None:
+        """Close the wave writer and its underlying file."""
+        if self._wf is not None:
+            self._wf.close()
+            self._wf = None
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
     def _callback(
         self,
         indata: np.ndarray,
@@ -110,4 +168,21 @@ class Recorder:
         status: sd.CallbackFlags,
     ) -> None:
         """sounddevice callback — called from a background thread."""
-        self._queue.put(indata.copy())
+        # indata is a contiguous int16 buffer; wave accepts it without a copy.
+        self._wf.writeframesraw(indata)
+        self._frames_written += frames
+        if self._chunk_queue is not None:
+            self._fill_chunk(indata[:, 0])
+
+    def _fill_chunk(self, samples: np.ndarray) -> None:
+        """Copy samples into the current chunk, queueing each chunk once full."""
+        pos = 0
+        while pos < len(samples):
+            take = min(len(samples) - pos, len(self._chunk_buf) - self._chunk_fill)
+            self._chunk_buf[self._chunk_fill : self._chunk_fill + take] = samples[pos : pos + take]
+            self._chunk_fill += take
+            pos += take
+            if self._chunk_fill == len(self._chunk_buf):
+                self._chunk_queue.put(self._chunk_buf)
+                self._chunk_buf = np.empty_like(self._chunk_buf)
+                self._chunk_fill = 0
@@ -1,11 +1,12 @@
+import json
 import os
+import select
+import time
 from datetime import datetime
 from pathlib import Path
 
-import yaml
-
 STATE_DIR = Path.home() / ".lecture-to-obsidian"
-STATE_FILE = STATE_DIR / "recording.pid"
+STATE_FILE = STATE_DIR / "recording.json"
 LOG_FILE = STATE_DIR / "record.log"
 
 
@@ -45,13 +46,17 @@ def get_recording_info() -> dict | None:
         return None
     try:
         with open(STATE_FILE) as f:
-            return yaml.safe_load(f)
+            return json.load(f)
     except Exception:
         return None
 
 
 def write_state(pid: int, course: str, title: str, date: str) -> None:
-    """Write a new recording state file."""
+    """Write a new recording state file.
+
+    Writes to a temporary file and renames it into place, so a concurrent
+    get_recording_info() never sees a partially written file.
+    """
     _ensure_state_dir()
     state = {
         "pid": pid,
@@ -60,10 +65,60 @@ def write_state(pid: int, course: str, title: str, date: str) -> None:
         "date": date,
         "start_time": datetime.now().isoformat(),
     }
-    with open(STATE_FILE, "w") as f:
-        yaml.dump(state, f)
+    tmp_file = STATE_FILE.with_suffix(".tmp")
+    with open(tmp_file, "w") as f:
+        json.dump(state, f)
+    os.replace(tmp_file, STATE_FILE)
 
 
 def clear_state() -> None:
     """Remove the recording state file if it exists."""
     STATE_FILE.unlink(missing_ok=True)
+
+
+def open_pidfd(pid: int) -> int | None:
+    """Return a pidfd for the process, or None if pidfds are unsupported.
+
+    pidfds are available on Linux 5.3+ (Python 3.9+). Raises ProcessLookupError
+    if the process has already exited.
+    """
+    if not hasattr(os, "pidfd_open"):
+        return None
+    try:
+        return os.pidfd_open(pid)
+    except OSError as exc:
+        if isinstance(exc, ProcessLookupError):
+            raise
+        return None
+
+
+def wait_for_exit(pid: int, timeout: float | None = None) -> bool:
+    """Block until the process exits. Returns False if the timeout elapsed first.
+
+    Waits on a pidfd with poll() where supported; otherwise probes the PID
+    with os.kill(pid, 0) every half second.
+    """
+    try:
+        fd = open_pidfd(pid)
+    except ProcessLookupError:
+        return True
+
+    if fd is not None:
+        try:
+            poller = select.poll()
+            poller.register(fd, select.POLLIN)
+            return bool(poller.poll(None if timeout is None else int(timeout * 1000)))
+        finally:
+            os.close(fd)
+
+    deadline = None if timeout is None else time.monotonic() + timeout
+    while True:
+        try:
+            os.kill(pid, 0)
+        except ProcessLookupError:
+            return True
+        except PermissionError:
+            pass
+        if deadline is not None and time.monotonic() >= deadline:
+            return False
+        time.sleep(0.5)
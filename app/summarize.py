@@ -1,12 +1,34 @@
+import re
 import sys
+import threading
+from array import array
+from concurrent.futures import ThreadPoolExecutor
 from textwrap import dedent
 
 import openai
 
+from app.cache import cache_enabled, get_cached, store_cached, text_key
+
 # Tokens / words per chunk when splitting long transcripts
 _CHUNK_WORDS = 8_000
 _OVERLAP_WORDS = 500
 
+_WORD_RE = re.compile(r"\S+")
+
+# Largest transcript (in words) each model summarizes in a single call:
+# min(context, max_output / 0.3), since notes run up to 30% of the transcript.
+# Both models have a 128k-token context (~90k words plus prompt) but cap output
+# at 16,384 tokens (~12k words), so output is the binding limit at ~40k words.
+# Unknown models fall back to the conservative default and are chunked above it.
+_MODEL_CTX_WORDS = {
+    "gpt-4o-mini": 40_000,
+    "gpt-4o": 40_000,
+}
+_DEFAULT_CTX_WORDS = 10_000
+
+# Concurrent partial-summary requests for chunked transcripts
+_MAX_LLM_WORKERS = 4
+
 _SYSTEM_PROMPT = dedent("""\
     You are an expert note-taker converting a raw lecture transcript into clean, structured study notes.
 
@@ -34,26 +56,47 @@ _MERGE_SYSTEM_PROMPT = dedent("""\
 """)
 
 
-def _word_count(text: str) -> int:
-    return len(text.split())
+def _word_spans(text: str) -> tuple[array, array]:
+    """Return the start and end character offsets of every word in text.
+
+    Offsets are kept in machine-integer arrays rather than lists of Python
+    ints, so long transcripts cost 16 bytes per word.
+    """
+    starts = array("q")
+    ends = array("q")
+    for match in _WORD_RE.finditer(text):
+        starts.append(match.start())
+        ends.append(match.end())
+    return starts, ends
+
 
+def _chunk_transcript(transcript: str, starts: array, ends: array) -> list[str]:
+    """Split transcript into overlapping word-level chunks.
 
-def _chunk_transcript(transcript: str) -> list[str]:
-    """Split transcript into overlapping word-level chunks."""
-    words = transcript.split()
+    Each chunk is a single slice of the original string, located via the
+    word offsets from _word_spans.
+    """
     chunks: list[str] = []
     start = 0
-    while start < len(words):
-        end = start + _CHUNK_WORDS
-        chunks.append(" ".join(words[start:end]))
-        if end >= len(words):
+    while start < len(starts):
+        end = min(start + _CHUNK_WORDS, len(starts))
+        chunks.append(transcript[starts[start] : ends[end - 1]])
+        if end >= len(starts):
             break
         start = end - _OVERLAP_WORDS
     return chunks
 
 
 def _call_llm(system: str, user: str, model: str) -> str:
-    """Make a single chat completion call and return the assistant content."""
+    """Make a single chat completion call and return the assistant content.
+
+    Responses are cached on disk keyed by (model, system, user), so re-running
+    the same transcript skips the API. Set L2O_NO_CACHE=1 to bypass the cache.
+    """
+    cache_key = text_key(model, system, user) if cache_enabled() else None
+    if cache_key and (cached := get_cached("llm", cache_key)) is not None:
+        return cached
+
     try:
         response = openai.chat.completions.create(
             model=model,
@@ -62,7 +105,7 @@ def _call_llm(system: str, user: str, model: str) -> str:
                 {"role": "user", "content": user},
             ],
         )
-        return response.choices[0].message.content.strip()
+        content = response.choices[0].message.content.strip()
     except openai.AuthenticationError:
         print("Error: Invalid OpenAI API key. Check OPENAI_API_KEY in your .env file.")
         sys.exit(1)
@@ -70,6 +113,10 @@ def _call_llm(system: str, user: str, model: str) -> str:
         print(f"Error: LLM API call failed — {e}")
         sys.exit(1)
 
+    if cache_key:
+        store_cached("llm", cache_key, content)
+    return content
+
 
 def summarize_transcript(
     transcript: str,
@@ -79,9 +126,10 @@ def summarize_transcript(
 ) -> str:
     """Convert a raw lecture transcript into a condensed, structured Markdown summary.
 
-    For transcripts over 10,000 words, the text is split into overlapping chunks,
-    each chunk is summarized independently, then a final merge pass produces the
-    unified note.
+    Transcripts that the model can summarize in one response (see
+    _MODEL_CTX_WORDS; 10,000 words for unknown models) take a single call.
+    Longer ones are split into overlapping chunks, each chunk is summarized
+    independently, then a final merge pass produces the unified note.
 
     Args:
         transcript: Full plain-text transcript.
@@ -96,26 +144,44 @@ def summarize_transcript(
     if course:
         context_header += f"\nCourse: {course}"
 
-    word_count = _word_count(transcript)
+    # str.split counts words in C; offsets are only needed once chunking
+    word_count = len(transcript.split())
 
-    if word_count <= 10_000:
+    if word_count <= _MODEL_CTX_WORDS.get(model, _DEFAULT_CTX_WORDS):
         user_msg = f"{context_header}\n\n---\n\n{transcript}"
         return _call_llm(_SYSTEM_PROMPT, user_msg, model)
 
     # Long transcript: chunk → summarize each → merge
-    chunks = _chunk_transcript(transcript)
+    starts, ends = _word_spans(transcript)
+    chunks = _chunk_transcript(transcript, starts, ends)
     print(f"  Transcript is {word_count:,} words — summarizing in {len(chunks)} chunks...")
 
-    partial_summaries: list[str] = []
-    for i, chunk in enumerate(chunks, 1):
-        print(f"  Summarizing chunk {i}/{len(chunks)}...")
-        user_msg = (
+    user_msgs = [
+        (
             f"{context_header}\n"
             f"(Part {i} of {len(chunks)})\n\n"
             "---\n\n"
             f"{chunk}"
         )
-        partial_summaries.append(_call_llm(_SYSTEM_PROMPT, user_msg, model))
+        for i, chunk in enumerate(chunks, 1)
+    ]
+
+    # Partial summaries are independent, so request them concurrently.
+    # executor.map keeps them in lecture order for the merge pass.
+    done = 0
+    done_lock = threading.Lock()
+
+    def summarize_chunk(user_msg: str) -> str:
+        nonlocal done
+        partial = _call_llm(_SYSTEM_PROMPT, user_msg, model)
+        with done_lock:
+            done += 1
+            print(f"  Summarized chunk {done}/{len(chunks)}")
+        return partial
+
+    workers = min(_MAX_LLM_WORKERS, len(chunks))
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        partial_summaries = list(executor.map(summarize_chunk, user_msgs))
 
     print("  Merging chunk summaries into final notes...")
     merge_input = "\n\n---\n\n".join(
@@ -1,14 +1,50 @@
+import functools
+import json
+import math
 import shutil
+import subprocess
 import sys
 import tempfile
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 
+import numpy as np
 import openai
 
+from app.cache import cache_enabled, file_key, get_cached, store_cached, text_key
+
+# Silence shorter than this is kept so pauses mid-sentence aren't cut out
+_VAD_MIN_SILENCE_MS = 500
+
+# Trailing words of the previous live chunk fed to the decoder as a prompt,
+# so speech cut at a chunk boundary is decoded with its context
+_PROMPT_TAIL_WORDS = 50
+
+_WHISPER_API_MODEL = "whisper-1"
+
+# Fallback re-encode settings for containers that can't be stream-copied.
+# Lossless formats ignore -b:a; 16 kHz mono 16-bit PCM is 256 kbps and FLAC
+# is at most that.
+_REENCODE_BIT_RATE = 64_000
+_LOSSLESS_BIT_RATE = 256_000
+_LOSSLESS_SUFFIXES = {".wav", ".flac"}
+
+# Concurrent Whisper API uploads; kept low to stay clear of rate limits
+_MAX_API_WORKERS = 4
+
+
+@functools.lru_cache(maxsize=1)
+def _which_ffmpeg() -> str | None:
+    """Return the ffmpeg executable path, scanning PATH only once per process."""
+    return shutil.which("ffmpeg")
+
 
 def check_ffmpeg() -> None:
-    """Verify ffmpeg is available on PATH. Exits with a helpful message if not."""
-    if shutil.which("ffmpeg") is None:
+    """Verify ffmpeg is available on PATH. Exits with a helpful message if not.
+
+    Only the "api" backend needs ffmpeg (to split large files).
+    """
+    if _which_ffmpeg() is None:
         print(
             "Error: ffmpeg is not installed or not on your PATH.\n"
             "Install it before running this tool:\n"
@@ -42,23 +78,72 @@ def transcribe_audio(audio_path: Path, config: dict | None = None) -> str:
     if backend == "api":
         return _transcribe_api(audio_path)
 
-    model_name = transcription_cfg.get("local_model", "base.en")
-    return transcribe_local(audio_path, model_name)
+    return transcribe_local(audio_path, **_local_options(transcription_cfg))
 
 
-def transcribe_local(audio_path: Path, model_name: str = "base.en") -> str:
-    """Transcribe using a local faster-whisper model.
+def transcribe_samples(
+    samples: np.ndarray,
+    config: dict | None = None,
+    previous_text: str = "",
+) -> str:
+    """Transcribe 16 kHz mono int16 PCM samples with the local backend.
 
-    On first run, the model weights are downloaded automatically (~150 MB for
-    base.en) to ~/.cache/huggingface/. Subsequent runs use the cached model.
+    Used to transcribe a live recording chunk by chunk while it is still in
+    progress (see Recorder.chunks).
 
     Args:
-        audio_path: Path to the audio file.
-        model_name: faster-whisper model name (e.g. "tiny.en", "base.en", "small.en").
+        samples: 1-D int16 array sampled at 16 kHz.
+        config: Loaded config dict; only the local-backend settings are used.
+        previous_text: Transcript of the preceding chunk. Its last few words
+            prime the decoder so words split across the boundary keep context.
 
     Returns:
-        Full transcript as a plain text string.
+        Transcript of the samples as a plain text string.
     """
+    transcription_cfg = (config or {}).get("transcription", {})
+    audio = samples.astype(np.float32) / 32768.0
+    prompt = " ".join(previous_text.split()[-_PROMPT_TAIL_WORDS:]) or None
+    return transcribe_local(audio, initial_prompt=prompt, **_local_options(transcription_cfg))
+
+
+def _local_options(transcription_cfg: dict) -> dict:
+    """Extract transcribe_local keyword arguments from config["transcription"]."""
+    return {
+        "model_name": transcription_cfg.get("local_model", "base.en"),
+        "device": transcription_cfg.get("device", "auto"),
+        "compute_type": transcription_cfg.get("compute_type", "auto"),
+        "beam_size": transcription_cfg.get("beam_size", 1),
+        "vad_filter": transcription_cfg.get("vad_filter", True),
+    }
+
+
+# Set once CUDA fails in this process, after which "auto" resolves to the CPU
+_cuda_failed = False
+
+
+@functools.lru_cache(maxsize=None)
+def _select_device(device: str = "auto", compute_type: str = "auto") -> tuple[str, str]:
+    """Resolve "auto" device/compute_type settings to concrete faster-whisper values.
+
+    Prefers CUDA with float16 weights when a GPU is visible to CTranslate2,
+    otherwise int8 on the CPU. transcribe_local drops back to the CPU if the
+    CUDA model then fails to load or run.
+    """
+    if device == "auto":
+        try:
+            import ctranslate2  # installed alongside faster-whisper
+
+            device = "cuda" if ctranslate2.get_cuda_device_count() > 0 else "cpu"
+        except Exception:
+            device = "cpu"
+    if compute_type == "auto":
+        compute_type = "float16" if device == "cuda" else "int8"
+    return device, compute_type
+
+
+@functools.lru_cache(maxsize=2)
+def _get_model(model_name: str, device: str, compute_type: str):
+    """Load a faster-whisper model, reusing it across calls in this process."""
     try:
         from faster_whisper import WhisperModel
     except ImportError:
@@ -68,10 +153,69 @@ def transcribe_local(audio_path: Path, model_name: str = "base.en") -> str:
         )
         sys.exit(1)
 
-    print(f"  Loading local Whisper model '{model_name}' (downloads on first run)...")
-    model = WhisperModel(model_name, device="cpu", compute_type="int8")
-    segments, _ = model.transcribe(str(audio_path), beam_size=5)
-    return " ".join(segment.text.strip() for segment in segments)
+    print(
+        f"  Loading local Whisper model '{model_name}' on {device} ({compute_type}) "
+        "(downloads on first run)..."
+    )
+    return WhisperModel(model_name, device=device, compute_type=compute_type)
+
+
+def transcribe_local(
+    audio: Path | np.ndarray,
+    model_name: str = "base.en",
+    device: str = "auto",
+    compute_type: str = "auto",
+    beam_size: int = 1,
+    vad_filter: bool = True,
+    initial_prompt: str | None = None,
+) -> str:
+    """Transcribe using a local faster-whisper model.
+
+    On first run, the model weights are downloaded automatically (~150 MB for
+    base.en) to ~/.cache/huggingface/. Subsequent runs use the cached model.
+
+    Args:
+        audio: Path to the audio file, or a float32 waveform sampled at 16 kHz.
+        model_name: faster-whisper model name (e.g. "tiny.en", "base.en", "small.en").
+        device: "cpu", "cuda", or "auto" to use a GPU when one is available.
+        compute_type: CTranslate2 compute type (e.g. "int8", "float16"), or
+            "auto" to pick the fastest type for the selected device.
+        beam_size: Decoder beam width. 1 (greedy) is several times faster than
+            5 with little accuracy loss on clear lecture audio.
+        vad_filter: Skip silent stretches with Silero VAD before decoding.
+        initial_prompt: Optional text preceding the audio, used as decoder context.
+
+    Returns:
+        Full transcript as a plain text string.
+    """
+    global _cuda_failed
+    auto_device = device == "auto"
+    if auto_device and _cuda_failed:
+        device, compute_type = "cpu", "int8"
+    else:
+        device, compute_type = _select_device(device, compute_type)
+
+    def run(device: str, compute_type: str) -> str:
+        model = _get_model(model_name, device, compute_type)
+        segments, _ = model.transcribe(
+            audio if isinstance(audio, np.ndarray) else str(audio),
+            beam_size=beam_size,
+            vad_filter=vad_filter,
+            vad_parameters=dict(min_silence_duration_ms=_VAD_MIN_SILENCE_MS),
+            initial_prompt=initial_prompt,
+        )
+        # Segments decode lazily, so CUDA library errors surface while joining
+        return " ".join(segment.text.strip() for segment in segments)
+
+    try:
+        return run(device, compute_type)
+    except Exception as exc:
+        # A visible GPU doesn't guarantee working cuBLAS/cuDNN libraries
+        if not (auto_device and device == "cuda"):
+            raise
+        print(f"  CUDA transcription failed ({exc}) — falling back to the CPU...")
+        _cuda_failed = True
+        return run("cpu", "int8")
 
 
 # ---------------------------------------------------------------------------
@@ -86,14 +230,16 @@ def _transcribe_api(audio_path: Path) -> str:
         return _transcribe_single(audio_path)
 
     print(f"  File is {file_size_mb:.1f} MB — splitting into chunks for Whisper API...")
-    chunk_paths = split_audio(audio_path)
+    chunk_paths = split_audio(audio_path, file_size_mb)
     tmp_dir = chunk_paths[0].parent
 
     try:
-        parts: list[str] = []
-        for i, chunk_path in enumerate(chunk_paths, 1):
-            print(f"  Transcribing chunk {i}/{len(chunk_paths)}...")
-            parts.append(_transcribe_single(chunk_path))
+        # Chunks are independent network calls; run them concurrently.
+        # executor.map preserves chunk order in the joined transcript.
+        print(f"  Transcribing {len(chunk_paths)} chunks concurrently...")
+        workers = min(_MAX_API_WORKERS, len(chunk_paths))
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            parts = list(executor.map(_transcribe_single, chunk_paths))
         return " ".join(parts)
     finally:
         for chunk_path in chunk_paths:
@@ -101,41 +247,128 @@ def _transcribe_api(audio_path: Path) -> str:
         tmp_dir.rmdir()
 
 
-def split_audio(audio_path: Path, max_size_mb: int = 24) -> list[Path]:
-    """Split an audio file into chunks under the Whisper API size limit."""
-    from pydub import AudioSegment  # lazy import — pydub is only needed for the API backend
-    audio = AudioSegment.from_file(str(audio_path))
-    file_size_mb = audio_path.stat().st_size / (1024 * 1024)
-    num_chunks = int(file_size_mb / max_size_mb) + 1
-    chunk_duration_ms = len(audio) // num_chunks
+def _probe_format(audio_path: Path) -> tuple[float, int | None]:
+    """Return (duration_seconds, bit_rate) of an audio file using ffprobe (no decode).
+
+    bit_rate is the first audio stream's, falling back to the container's
+    overall rate when the stream doesn't report one, and None when neither does.
+    """
+    result = subprocess.run(
+        [
+            "ffprobe", "-v", "error",
+            "-print_format", "json",
+            "-select_streams", "a:0",
+            "-show_streams",
+            "-show_format",
+            str(audio_path),
+        ],
+        check=True,
+        capture_output=True,
+        text=True,
+    )
+    probe = json.loads(result.stdout)
+    fmt = probe["format"]
+    streams = probe.get("streams") or [{}]
+    bit_rate = streams[0].get("bit_rate") or fmt.get("bit_rate")
+    return float(fmt["duration"]), int(bit_rate) if bit_rate else None
 
-    tmp_dir = Path(tempfile.mkdtemp(prefix="lecture2obs_"))
-    chunk_paths: list[Path] = []
 
-    for i in range(num_chunks):
-        start_ms = i * chunk_duration_ms
-        end_ms = start_ms + chunk_duration_ms if i < num_chunks - 1 else len(audio)
-        chunk = audio[start_ms:end_ms]
-        chunk_path = tmp_dir / f"chunk_{i:03d}{audio_path.suffix}"
-        chunk.export(str(chunk_path), format=audio_path.suffix.lstrip("."))
-        chunk_paths.append(chunk_path)
+def _chunk_seconds(duration: float, bit_rate: float, max_size_mb: int) -> int:
+    """Return a segment length that keeps chunks of bit_rate audio under max_size_mb."""
+    max_chunk_seconds = max_size_mb * 8 * 1024 * 1024 / bit_rate
+    num_chunks = max(math.ceil(duration / max_chunk_seconds), 1)
+    return math.ceil(duration / num_chunks)
 
-    return chunk_paths
+
+def _segment_audio(audio_path: Path, out_dir: Path, chunk_seconds: int, copy: bool) -> None:
+    """Cut audio_path into chunk_seconds-long files in out_dir with ffmpeg's segment muxer.
+
+    With copy=False the audio is re-encoded as 16 kHz mono at _REENCODE_BIT_RATE
+    (ignored by lossless formats, which land at or below _LOSSLESS_BIT_RATE).
+    """
+    if copy:
+        codec_args = ["-c", "copy"]
+    else:
+        codec_args = ["-ac", "1", "-ar", "16000", "-b:a", str(_REENCODE_BIT_RATE)]
+    subprocess.run(
+        [
+            _which_ffmpeg() or "ffmpeg", "-v", "error", "-i", str(audio_path),
+            # First audio stream only: drop video and cover art
+            "-map", "0:a:0",
+            "-f", "segment",
+            "-segment_time", str(chunk_seconds),
+            *codec_args,
+            "-reset_timestamps", "1",
+            str(out_dir / f"chunk_%03d{audio_path.suffix}"),
+        ],
+        check=True,
+        capture_output=True,
+    )
+
+
+def split_audio(audio_path: Path, file_size_mb: float, max_size_mb: int = 24) -> list[Path]:
+    """Split an audio file into chunks under the Whisper API size limit.
+
+    file_size_mb is the caller's size measurement of audio_path, used when
+    the container doesn't report a bitrate.
+
+    Uses ffmpeg's segment muxer with stream copy, so the audio is never
+    decoded or re-encoded and memory use does not grow with file size.
+    Containers that can't be stream-copied are re-encoded as a fallback.
+    """
+    duration, bit_rate = _probe_format(audio_path)
+    if bit_rate:
+        chunk_seconds = _chunk_seconds(duration, bit_rate, max_size_mb)
+    else:
+        num_chunks = int(file_size_mb / max_size_mb) + 1
+        chunk_seconds = math.ceil(duration / num_chunks)
+
+    tmp_dir = Path(tempfile.mkdtemp(prefix="lecture2obs_"))
+    try:
+        try:
+            _segment_audio(audio_path, tmp_dir, chunk_seconds, copy=True)
+        except subprocess.CalledProcessError:
+            for partial in tmp_dir.iterdir():
+                partial.unlink()
+            # Re-encoded chunks have a known bitrate, independent of the source's;
+            # size the segments for that rate.
+            if audio_path.suffix.lower() in _LOSSLESS_SUFFIXES:
+                reencode_bit_rate = _LOSSLESS_BIT_RATE
+            else:
+                reencode_bit_rate = _REENCODE_BIT_RATE
+            reencode_seconds = _chunk_seconds(duration, reencode_bit_rate, max_size_mb)
+            _segment_audio(audio_path, tmp_dir, reencode_seconds, copy=False)
+    except Exception:
+        shutil.rmtree(tmp_dir, ignore_errors=True)
+        raise
+
+    return sorted(tmp_dir.glob(f"chunk_*{audio_path.suffix}"))
 
 
 def _transcribe_single(audio_path: Path) -> str:
-    """Transcribe a single audio file under 25 MB using the Whisper API."""
+    """Transcribe a single audio file under 25 MB using the Whisper API.
+
+    Results are cached on disk keyed by the file's SHA-256. Set
+    L2O_NO_CACHE=1 to bypass the cache.
+    """
+    cache_key = text_key(_WHISPER_API_MODEL, file_key(audio_path)) if cache_enabled() else None
+    if cache_key and (cached := get_cached("whisper", cache_key)) is not None:
+        return cached
+
     try:
         with open(audio_path, "rb") as f:
             response = openai.audio.transcriptions.create(
-                model="whisper-1",
+                model=_WHISPER_API_MODEL,
                 file=f,
                 response_format="text",
             )
-        return response
     except openai.AuthenticationError:
         print("Error: Invalid OpenAI API key. Check OPENAI_API_KEY in your .env file.")
         sys.exit(1)
     except openai.OpenAIError as e:
         print(f"Error: Whisper API call failed — {e}")
         sys.exit(1)
+
+    if cache_key:
+        store_cached("whisper", cache_key, response)
+    return response
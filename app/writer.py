@@ -1,44 +1,85 @@
-import re
+import os
 import sys
 from pathlib import Path
+from typing import NamedTuple
 
 import yaml
 
+# libyaml's C parser when PyYAML was built with it; pure-Python otherwise
+_YAML_LOADER = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+
+_DEFAULT_NOTE_TEMPLATE = {"tag_style": "wikilink", "status": "#review"}
+
+# Characters not safe in filenames, plus "-", which titles collapse to a space
+_UNSAFE_TO_SPACE = str.maketrans({c: " " for c in '<>:"/\\|?*-'})
+
+
+# Parsed configs keyed by path, with the (mtime_ns, size) they were parsed at
+_CONFIG_CACHE: dict[Path, tuple[int, int, dict]] = {}
+
 
 def load_config(config_path: Path) -> dict:
-    """Load and return the YAML config. Exits with a helpful message if missing."""
-    if not config_path.exists():
+    """Load and return the YAML config. Exits with a helpful message if missing.
+
+    The parsed config is cached until the file's mtime or size changes.
+    Callers must treat the returned dict as read-only.
+    """
+    try:
+        st = os.stat(config_path)
+    except FileNotFoundError:
         print(
             f"Error: config.yaml not found at {config_path}\n"
             "Run `python cli.py init` to create it."
         )
         sys.exit(1)
+    cached = _CONFIG_CACHE.get(config_path)
+    if cached is not None and cached[:2] == (st.st_mtime_ns, st.st_size):
+        return cached[2]
     with open(config_path) as f:
-        return yaml.safe_load(f)
+        config = yaml.load(f, Loader=_YAML_LOADER)
+    _CONFIG_CACHE[config_path] = (st.st_mtime_ns, st.st_size, config)
+    return config
 
 
 def safe_filename(title: str) -> str:
     """Convert a title into a safe filename by removing/replacing unsafe characters."""
-    # Replace characters not safe for filenames with a dash
-    name = re.sub(r'[<>:"/\\|?*]', "-", title)
-    # Collapse multiple dashes/spaces and strip leading/trailing whitespace/dashes
-    name = re.sub(r"[\s-]+", " ", name).strip(" -")
-    return name
+    # Unsafe characters and dashes become spaces, then runs of whitespace
+    # collapse to one space (which also drops leading/trailing whitespace)
+    return " ".join(title.translate(_UNSAFE_TO_SPACE).split())
 
 
-def _unique_path(path: Path) -> Path:
-    """If path exists, append _1, _2, etc. until we find an unused name."""
-    if not path.exists():
-        return path
-    stem = path.stem
-    suffix = path.suffix
-    parent = path.parent
-    counter = 1
+def _write_unique(directory: str, stem: str, suffix: str, data: bytes) -> str:
+    """Write data to directory/stem+suffix, appending _1, _2, etc. if the name is taken.
+
+    Each candidate is created with O_CREAT | O_EXCL, so picking the name and
+    creating the file is a single atomic step. Names already present in a
+    one-time directory listing are skipped without a syscall; they are
+    compared exactly, and O_EXCL catches case-only collisions on
+    case-insensitive filesystems.
+
+    Returns:
+        Path of the file that was written.
+    """
+    try:
+        with os.scandir(directory) as entries:
+            taken = {entry.name for entry in entries}
+    except OSError:
+        taken = set()
+
+    counter = 0
     while True:
-        candidate = parent / f"{stem}_{counter}{suffix}"
-        if not candidate.exists():
-            return candidate
+        name = f"{stem}{suffix}" if counter == 0 else f"{stem}_{counter}{suffix}"
         counter += 1
+        if name in taken:
+            continue
+        path = os.path.join(directory, name)
+        try:
+            fd = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o666)
+        except FileExistsError:
+            continue
+        with os.fdopen(fd, "wb") as f:
+            f.write(data)
+        return path
 
 
 def _format_tag(value: str, style: str) -> str:
@@ -48,6 +89,42 @@ def _format_tag(value: str, style: str) -> str:
     return f"[[{value}]]"
 
 
+class _VaultSettings(NamedTuple):
+    vault_path: str
+    inbox_folder: str
+    source_folder: str
+    tag_style: str
+    status_tag: str
+
+
+# The config dict the settings were resolved from, and the settings themselves
+_VAULT_SETTINGS_CACHE: tuple[dict, _VaultSettings] | None = None
+
+
+def _vault_settings(config: dict) -> _VaultSettings:
+    """Resolve vault paths and note-template settings, once per config object.
+
+    load_config returns the same dict until config.yaml changes, so repeated
+    write_notes calls skip the lookups and expanduser(). Holding a reference
+    to the dict keeps its identity from being reused by another object.
+    """
+    global _VAULT_SETTINGS_CACHE
+    if _VAULT_SETTINGS_CACHE is not None and _VAULT_SETTINGS_CACHE[0] is config:
+        return _VAULT_SETTINGS_CACHE[1]
+
+    vault = config["vault"]
+    note_template = {**_DEFAULT_NOTE_TEMPLATE, **(config.get("note_template") or {})}
+    settings = _VaultSettings(
+        vault_path=os.path.expanduser(vault["path"]),
+        inbox_folder=vault.get("inbox_folder", "1 - Inbox"),
+        source_folder=vault.get("source_folder", "2 - Source Materials/Lectures"),
+        tag_style=note_template["tag_style"],
+        status_tag=note_template["status"],
+    )
+    _VAULT_SETTINGS_CACHE = (config, settings)
+    return settings
+
+
 def write_notes(
     summary: str,
     transcript: str,
@@ -69,45 +146,43 @@ def write_notes(
     Returns:
         Tuple of (summary_path, transcript_path) as absolute Paths.
     """
-    vault_path = Path(config["vault"]["path"]).expanduser()
-    inbox_folder = config["vault"].get("inbox_folder", "1 - Inbox")
-    source_folder = config["vault"].get("source_folder", "2 - Source Materials/Lectures")
-    tag_style = config.get("note_template", {}).get("tag_style", "wikilink")
-    status_tag = config.get("note_template", {}).get("status", "#review")
+    settings = _vault_settings(config)
+    vault_path = settings.vault_path
 
-    if not vault_path.exists():
+    if not os.path.exists(vault_path):
         print(
             f"Warning: Vault path does not exist: {vault_path}\n"
             "Writing files to the current directory instead."
         )
-        vault_path = Path.cwd()
+        vault_path = os.getcwd()
 
-    inbox_dir = vault_path / inbox_folder
-    source_dir = vault_path / source_folder
-    inbox_dir.mkdir(parents=True, exist_ok=True)
-    source_dir.mkdir(parents=True, exist_ok=True)
+    # Plain string paths internally; Path objects only at the return boundary.
+    inbox_dir = os.path.join(vault_path, settings.inbox_folder)
+    source_dir = os.path.join(vault_path, settings.source_folder)
+    os.makedirs(inbox_dir, exist_ok=True)
+    os.makedirs(source_dir, exist_ok=True)
 
     filename_base = safe_filename(title)
 
     # --- Raw transcript file ---
-    transcript_path = _unique_path(source_dir / f"{filename_base} - Transcript.md")
     transcript_content = _build_transcript_note(transcript, title, date)
-    transcript_path.write_text(transcript_content, encoding="utf-8")
+    transcript_path = _write_unique(
+        source_dir, f"{filename_base} - Transcript", ".md", transcript_content.encode("utf-8")
+    )
 
     # --- Summary note file ---
-    summary_path = _unique_path(inbox_dir / f"{filename_base}.md")
     summary_content = _build_summary_note(
         summary=summary,
         title=title,
         date=date,
         course=course,
-        transcript_filename=transcript_path.stem,
-        tag_style=tag_style,
-        status_tag=status_tag,
+        transcript_filename=os.path.splitext(os.path.basename(transcript_path))[0],
+        tag_style=settings.tag_style,
+        status_tag=settings.status_tag,
     )
-    summary_path.write_text(summary_content, encoding="utf-8")
+    summary_path = _write_unique(inbox_dir, filename_base, ".md", summary_content.encode("utf-8"))
 
-    return summary_path, transcript_path
+    return Path(summary_path), Path(transcript_path)
 
 
 def _build_summary_note(
@@ -119,32 +194,16 @@ def _build_summary_note(
     tag_style: str,
     status_tag: str,
 ) -> str:
-    lines = [date, ""]
-    lines.append(f"Status: {status_tag}")
-    lines.append("")
-
-    if course:
-        tag = _format_tag(course, tag_style)
-        lines.append(f"Tags: {tag}")
-        lines.append("")
-
-    lines.append(f"Transcript: [[{transcript_filename}]]")
-    lines.append("")
-    lines.append(f"# {title}")
-    lines.append("")
-    lines.append(summary)
-
-    return "\n".join(lines)
+    tag_block = f"Tags: {_format_tag(course, tag_style)}\n\n" if course else ""
+    return (
+        f"{date}\n\n"
+        f"Status: {status_tag}\n\n"
+        f"{tag_block}"
+        f"Transcript: [[{transcript_filename}]]\n\n"
+        f"# {title}\n\n"
+        f"{summary}"
+    )
 
 
 def _build_transcript_note(transcript: str, title: str, date: str) -> str:
-    lines = [
-        date,
-        "",
-        "Status: #source",
-        "",
-        f"# {title} - Full Transcript",
-        "",
-        transcript,
-    ]
-    return "\n".join(lines)
+    return f"{date}\n\nStatus: #source\n\n# {title} - Full Transcript\n\n{transcript}"